@@ -1,15 +1,29 @@
 import streamlit as st
-import pandas as pd
+import streamlit.components.v1 as components
 import random
+import functools
 import json
-from typing import Dict, Optional
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import html
+import sys
+import time
+import hashlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import gspread
+
+
+WORD_FIELDS = ('word', 'explanation', 'related_words', 'pos', 'usage', 'sentence')
+# 內容大量重複的欄位（例如詞性只有 adj./v./n. 等少數幾種）
+INTERNED_FIELDS = ('pos', 'related_words')
 
 
 class Word:
     """單字資料類別"""
     
+    __slots__ = WORD_FIELDS
+    
     def __init__(self, word: str, explanation: str, related_words: str, 
                  pos: str, usage: str, sentence: str):
         self.word = word
@@ -31,171 +45,383 @@ class Word:
         }
 
 
-class GoogleSheetConnector:
-    """Google Sheet 連接器"""
-    
-    def __init__(self):
-        self.credentials = None
-        self.client = None
-        self.sheet = None
+SHEET_SCOPE = ['https://spreadsheets.google.com/feeds',
+               'https://www.googleapis.com/auth/drive']
+
+# 單字資料快取（記憶體與本地檔案共用同一個有效期限，單位：秒）
+# 記憶體快取從讀入時起算，若讀到的是快到期的本地快取，資料最舊可達 2 × CACHE_TTL
+CACHE_DIR = Path(".cache")
+CACHE_TTL = 3600
+
+
+@st.cache_resource(show_spinner=False)
+def get_gspread_client() -> "gspread.Client":
+    """取得所有 session 共用的已授權 gspread client"""
+    # 只有使用 Google Sheet 時才載入，範例資料不需負擔匯入成本
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
     
-    def setup_credentials_from_secrets(self):
-        """設置 Google Sheet 憑證"""
-        try:
+    credentials = ServiceAccountCredentials.from_json_keyfile_dict(
+        json.loads(st.secrets['gsheet-conn']['credits']), SHEET_SCOPE)
+    return gspread.authorize(credentials)
 
-            scope = ['https://spreadsheets.google.com/feeds',
-                    'https://www.googleapis.com/auth/drive']
-            self.credentials = ServiceAccountCredentials.from_json_keyfile_dict(json.loads(st.secrets['gsheet-conn']['credits']), scope)
-            self.client = gspread.authorize(self.credentials)
-            return True
-        except Exception as e:
-            st.error(f"憑證設置失敗: {e}")
-            return False
+
+def _fetch_sheet_values(sheet_url: str, worksheet_name: str) -> List[Dict]:
+    """從 Google Sheet API 讀取單字資料"""
+    spreadsheet = get_gspread_client().open_by_url(sheet_url)
+    # 一次 batchGet 取回標題列與所有資料列，不另外讀取工作表 metadata
+    # A1 表示法中，加引號的工作表名稱內的單引號需寫成兩個
+    sheet_range = "'{}'".format(worksheet_name.replace("'", "''"))
+    value_range = spreadsheet.values_batch_get(ranges=[sheet_range])['valueRanges'][0]
+    values = value_range.get('values', [])
+    if not values:
+        return []
+    header, *rows = values
+    # API 會省略列尾的空白儲存格，補齊後再對應欄位
+    return [dict(zip(header, row + [''] * (len(header) - len(row)))) for row in rows]
+
+
+def _disk_cache_path(sheet_url: str, worksheet_name: str) -> Path:
+    """依 Sheet URL 與工作表名稱決定本地快取檔路徑"""
+    key = hashlib.sha1(f"{sheet_url}|{worksheet_name}".encode('utf-8')).hexdigest()
+    return CACHE_DIR / f"vocab_{key}.json"
+
+
+def _read_disk_cache(path: Path) -> Optional[List[Dict]]:
+    """讀取未過期的本地快取，不存在或已過期時回傳 None"""
+    try:
+        if time.time() - path.stat().st_mtime >= CACHE_TTL:
+            return None
+        with path.open(encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_disk_cache(path: Path, records: List[Dict]):
+    """寫入本地快取（失敗時略過，不影響載入）"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _fetch_sheet(sheet_url: str, worksheet_name: str) -> List[Dict]:
+    """從 Google Sheet 抓取單字資料（記憶體快取 → 本地快取 → 網路）"""
+    path = _disk_cache_path(sheet_url, worksheet_name)
+    records = _read_disk_cache(path)
+    if records is None:
+        records = _fetch_sheet_values(sheet_url, worksheet_name)
+        if not records:
+            # 以例外結束，空結果不會被記憶體或本地快取保存，補上資料後可立即重試
+            raise ValueError("工作表中沒有單字資料")
+        _write_disk_cache(path, records)
+    return records
+
+
+class GoogleSheetConnector:
+    """Google Sheet 連接器（不保存狀態，可跨 session 共用）"""
     
-    def connect_sheet(self, sheet_url: str, worksheet_name: str = "工作表1"):
-        """連接到指定的 Google Sheet"""
+    def connect_sheet(self):
+        """確認 Google Sheet 憑證可用"""
         try:
-            self.sheet = self.client.open_by_url(sheet_url).worksheet(worksheet_name)
-            return True
+            get_gspread_client()
         except Exception as e:
-            st.error(f"連接 Google Sheet 失敗: {e}")
+            st.error(f"憑證設置失敗: {e}")
             return False
+        return True
     
-    def fetch_vocabulary_data(self) -> pd.DataFrame:
+    def fetch_vocabulary_data(self, sheet_url: str, worksheet_name: str = "工作表1") -> List[Dict]:
         """從 Google Sheet 獲取單字資料"""
         try:
-            data = self.sheet.get_all_records()
-            return pd.DataFrame(data)
+            return _fetch_sheet(sheet_url, worksheet_name)
         except Exception as e:
             st.error(f"獲取資料失敗: {e}")
-            return pd.DataFrame()
+            return []
+
+
+# 卡片樣式（與卡片 HTML 一起包進 iframe 元件，卡片本身只帶 class 名稱）
+_CARD_CSS = """
+<style>
+body {
+    margin: 0;
+    font-family: "Source Sans Pro", sans-serif;
+}
+.controls {
+    display: flex;
+    gap: 12px;
+    justify-content: center;
+}
+.deck-btn {
+    flex: 0 1 40%;
+    padding: 0.5em 1em;
+    border: 1px solid rgba(49, 51, 63, 0.2);
+    border-radius: 0.5rem;
+    background: #FFFFFF;
+    color: #31333F;
+    font-family: inherit;
+    font-size: 1rem;
+    cursor: pointer;
+}
+.deck-btn:hover:enabled {
+    border-color: #D4B5A0;
+    color: #8B7B6B;
+}
+.deck-btn:disabled {
+    cursor: default;
+    opacity: 0.6;
+}
+.progress {
+    margin-top: 8px;
+    text-align: center;
+    color: #9B8F84;
+}
+.vocab-card {
+    border-radius: 20px;
+    padding: 40px;
+    text-align: center;
+    margin: 20px 0;
+    position: relative;
+    overflow: hidden;
+}
+.vocab-card h1 {
+    color: #8B7B6B;
+    margin-bottom: 20px;
+    font-weight: 300;
+}
+.vocab-card .glow {
+    position: absolute;
+}
+.vocab-card .line {
+    color: #6B5D56;
+    margin: 12px 0;
+    font-size: 1.1em;
+    line-height: 1.5;
+}
+.vocab-card .line strong {
+    color: #8B7B6B;
+    font-weight: 500;
+}
+.vocab-card .accent {
+    color: #A08B7A;
+}
+.vocab-card .muted {
+    color: #7A6E65;
+}
+.vocab-card.front {
+    border: 2px solid #D4B5A0;
+    background: linear-gradient(135deg, #F5F1EB 0%, #E8DDD4 100%);
+    box-shadow: 0 8px 25px rgba(186, 159, 143, 0.2);
+}
+.vocab-card.front .glow {
+    top: -50px;
+    right: -50px;
+    width: 100px;
+    height: 100px;
+    background: radial-gradient(circle, rgba(212, 181, 160, 0.1) 0%, transparent 70%);
+}
+.vocab-card.front h1 {
+    font-size: 2.5em;
+    letter-spacing: 2px;
+    text-shadow: 1px 1px 2px rgba(139, 123, 107, 0.1);
+}
+.vocab-card.front .pos {
+    background: rgba(186, 159, 143, 0.15);
+    padding: 15px 25px;
+    border-radius: 25px;
+    margin: 20px auto;
+    display: inline-block;
+}
+.vocab-card.front .pos h3 {
+    color: #A08B7A;
+    margin: 0;
+    font-weight: 400;
+}
+.vocab-card.front .usage {
+    color: #9B8F84;
+    font-style: italic;
+    font-size: 1.2em;
+    margin-top: 25px;
+    line-height: 1.6;
+}
+.vocab-card.front .sentence {
+    color: #7A6E65;
+    font-style: italic;
+}
+.vocab-card.back {
+    border: 2px solid #C4A69C;
+    background: linear-gradient(135deg, #F0E6E0 0%, #E5D5CE 100%);
+    box-shadow: 0 8px 25px rgba(196, 166, 156, 0.25);
+}
+.vocab-card.back .glow {
+    top: -30px;
+    left: -30px;
+    width: 80px;
+    height: 80px;
+    background: radial-gradient(circle, rgba(196, 166, 156, 0.08) 0%, transparent 70%);
+}
+.vocab-card.back h1 {
+    font-size: 3.2em;
+    letter-spacing: 1px;
+}
+.vocab-card.back h2 {
+    color: #A0827A;
+    margin-bottom: 30px;
+    font-weight: 400;
+    font-size: 1.8em;
+}
+.vocab-card.back .details {
+    text-align: left;
+    background: rgba(255, 250, 247, 0.95);
+    padding: 25px;
+    border-radius: 15px;
+    margin: 20px 0;
+    border: 1px solid rgba(196, 166, 156, 0.2);
+}
+</style>
+"""
+
+_FRONT_TMPL = (
+    '<div class="vocab-card front"><div class="glow"></div>'
+    '<h1>{word}</h1>'
+    '<div class="pos"><h3>({pos})</h3></div>'
+    '<p class="usage">{usage}</p>'
+    '<p class="line"><span class="sentence">{sentence}</span></p>'
+    '</div>'
+)
+
+_BACK_TMPL = (
+    '<div class="vocab-card back"><div class="glow"></div>'
+    '<h1>{word}</h1>'
+    '<h2>{explanation}</h2>'
+    '<div class="details">'
+    '<p class="line"><strong>詞性:</strong> <span class="accent">{pos}</span></p>'
+    '<p class="line"><strong>用法:</strong> <span class="muted">{usage}</span></p>'
+    '<p class="line"><strong>相關詞彙:</strong> <span class="accent">{related_words}</span></p>'
+    '</div></div>'
+)
+
+
+# 翻面與換下一張都在瀏覽器端進行，整副卡片看完才需要回到 Python 重新抽選
+_DECK_SCRIPT = """
+<script>
+const cards = Array.from(document.querySelectorAll('.deck-card'));
+const flipButton = document.getElementById('flip');
+const nextButton = document.getElementById('next');
+const progress = document.getElementById('progress');
+let index = 0;
+let showBack = false;
+
+function show() {
+    cards.forEach((card, i) => {
+        card.style.display = i === index ? 'block' : 'none';
+    });
+    const current = cards[index];
+    current.querySelector('.face-front').style.display = showBack ? 'none' : 'block';
+    current.querySelector('.face-back').style.display = showBack ? 'block' : 'none';
+    flipButton.textContent = showBack ? '🔄 顯示英文' : '🔄 顯示中文釋義';
+    const last = index === cards.length - 1;
+    nextButton.disabled = last;
+    nextButton.textContent = last ? '✅ 這一輪已看完' : '➡️ 下一個單字';
+    progress.textContent = `${index + 1} / ${cards.length}`;
+}
+
+flipButton.addEventListener('click', () => {
+    showBack = !showBack;
+    show();
+});
+nextButton.addEventListener('click', () => {
+    if (index < cards.length - 1) {
+        index += 1;
+        showBack = false;
+        show();
+    }
+});
+show();
+</script>
+"""
+
+_DECK_CONTROLS = (
+    '<div class="controls">'
+    '<button class="deck-btn" id="flip">🔄 顯示中文釋義</button>'
+    '<button class="deck-btn" id="next">➡️ 下一個單字</button>'
+    '</div>'
+    '<div class="progress" id="progress"></div>'
+)
+
+# 每次抽選預先送到瀏覽器的單字數
+DECK_SIZE = 20
+CARD_HEIGHT = 660
+
+
+@functools.lru_cache(maxsize=1024)
+def build_card_html(word: str, explanation: str, related_words: str,
+                    pos: str, usage: str, sentence: str) -> str:
+    """組出含正反面的卡片 HTML（以單字內容為 key，跨 session 共用）"""
+    # 卡片在可執行 script 的 iframe 中顯示，Sheet 內容一律先轉義
+    word, explanation, related_words, pos, usage, sentence = (
+        html.escape(str(value))
+        for value in (word, explanation, related_words, pos, usage, sentence)
+    )
+    front = _FRONT_TMPL.format(word=word, pos=pos, usage=usage, sentence=sentence)
+    back = _BACK_TMPL.format(word=word, explanation=explanation, pos=pos,
+                             usage=usage, related_words=related_words)
+    return (
+        '<div class="deck-card" style="display: none;">'
+        f'<div class="face-front">{front}</div>'
+        f'<div class="face-back" style="display: none;">{back}</div>'
+        '</div>'
+    )
 
 
 class VocabularyCard:
     """單字卡片類別"""
     
+    __slots__ = ('word', 'html')
+    
     def __init__(self, word: Word):
         self.word = word
-        self.is_flipped = False
+        self.html = build_card_html(
+            word.word, word.explanation, word.related_words,
+            word.pos, word.usage, word.sentence
+        )
+
+
+class VocabularyDeck:
+    """一輪預先抽好的單字卡片"""
     
-    def flip_card(self):
-        """翻轉卡片"""
-        self.is_flipped = not self.is_flipped
+    __slots__ = ('cards', 'draw')
     
-    def reset_card(self):
-        """重置卡片到正面（英文）"""
-        self.is_flipped = False
+    def __init__(self, cards: List[VocabularyCard], draw: int):
+        self.cards = cards
+        self.draw = draw
     
-    def render_front(self):
-        """渲染卡片正面（英文）"""
-        st.markdown(f"""
-        <div style="
-            border: 2px solid #D4B5A0;
-            border-radius: 20px;
-            padding: 40px;
-            text-align: center;
-            background: linear-gradient(135deg, #F5F1EB 0%, #E8DDD4 100%);
-            box-shadow: 0 8px 25px rgba(186, 159, 143, 0.2);
-            margin: 20px 0;
-            position: relative;
-            overflow: hidden;
-        ">
-            <div style="
-                position: absolute;
-                top: -50px;
-                right: -50px;
-                width: 100px;
-                height: 100px;
-                background: radial-gradient(circle, rgba(212, 181, 160, 0.1) 0%, transparent 70%);
-            "></div>
-            <h1 style="
-                color: #8B7B6B; 
-                font-size: 2.5em; 
-                margin-bottom: 20px;
-                font-weight: 300;
-                letter-spacing: 2px;
-                text-shadow: 1px 1px 2px rgba(139, 123, 107, 0.1);
-            ">{self.word.word}</h1>
-            <div style="
-                background: rgba(186, 159, 143, 0.15);
-                padding: 15px 25px;
-                border-radius: 25px;
-                margin: 20px auto;
-                display: inline-block;
-            ">
-                <h3 style="color: #A08B7A; margin: 0; font-weight: 400;">({self.word.pos})</h3>
-            </div>
-            <p style="
-                color: #9B8F84; 
-                font-style: italic; 
-                font-size: 1.2em;
-                margin-top: 25px;
-                line-height: 1.6;
-            ">{self.word.usage}</p>
-            <p style="color: #6B5D56; margin: 12px 0; font-size: 1.1em; line-height: 1.5;">
-                    <span style="color: #7A6E65; font-style: italic;">{self.word.sentence}</span>
-                </p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    def render_back(self):
-        """渲染卡片背面（中文釋義）"""
-        st.markdown(f"""
-        <div style="
-            border: 2px solid #C4A69C;
-            border-radius: 20px;
-            padding: 40px;
-            text-align: center;
-            background: linear-gradient(135deg, #F0E6E0 0%, #E5D5CE 100%);
-            box-shadow: 0 8px 25px rgba(196, 166, 156, 0.25);
-            margin: 20px 0;
-            position: relative;
-            overflow: hidden;
-        ">
-            <div style="
-                position: absolute;
-                top: -30px;
-                left: -30px;
-                width: 80px;
-                height: 80px;
-                background: radial-gradient(circle, rgba(196, 166, 156, 0.08) 0%, transparent 70%);
-            "></div>
-            <h1 style="
-                color: #8B7B6B; 
-                font-size: 3.2em; 
-                margin-bottom: 20px;
-                font-weight: 300;
-                letter-spacing: 1px;
-            ">{self.word.word}</h1>
-            <h2 style="
-                color: #A0827A; 
-                margin-bottom: 30px;
-                font-weight: 400;
-                font-size: 1.8em;
-            ">{self.word.explanation}</h2>
-            <div style="
-                text-align: left; 
-                background: rgba(255, 250, 247, 0.95); 
-                padding: 25px; 
-                border-radius: 15px; 
-                margin: 20px 0;
-                border: 1px solid rgba(196, 166, 156, 0.2);
-            ">
-                <p style="color: #6B5D56; margin: 12px 0; font-size: 1.1em; line-height: 1.5;">
-                    <strong style="color: #8B7B6B; font-weight: 500;">詞性:</strong> 
-                    <span style="color: #A08B7A;">{self.word.pos}</span>
-                </p>
-                <p style="color: #6B5D56; margin: 12px 0; font-size: 1.1em; line-height: 1.5;">
-                    <strong style="color: #8B7B6B; font-weight: 500;">用法:</strong> 
-                    <span style="color: #7A6E65;">{self.word.usage}</span>
-                </p>
-                <p style="color: #6B5D56; margin: 12px 0; font-size: 1.1em; line-height: 1.5;">
-                    <strong style="color: #8B7B6B; font-weight: 500;">相關詞彙:</strong> 
-                    <span style="color: #A08B7A;">{self.word.related_words}</span>
-                </p>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    def render(self):
+        """渲染整副卡片（正面英文、背面中文釋義，於瀏覽器端翻面與換卡）"""
+        # 帶入抽選次數，即使抽到相同的卡片也會重新載入 iframe 並翻回正面
+        components.html(
+            _CARD_CSS
+            + f'<div class="deck" data-draw="{self.draw}">'
+            + _DECK_CONTROLS
+            + ''.join(card.html for card in self.cards)
+            + '</div>'
+            + _DECK_SCRIPT,
+            height=CARD_HEIGHT,
+            scrolling=True
+        )
+
+
+def _intern_column(values) -> List[str]:
+    """將重複度高的欄位字串 intern，相同內容只保留一份"""
+    return [sys.intern(str(value)) for value in values]
+
+
+def _empty_columns() -> Dict[str, List[str]]:
+    """建立空的欄式單字表"""
+    return {field: [] for field in WORD_FIELDS}
 
 
 class VocabularyManager:
@@ -203,124 +429,215 @@ class VocabularyManager:
     
     def __init__(self):
         self.sheet_connector = GoogleSheetConnector()
-        # 初始化 session state 中的單字列表
-        if 'vocabulary_list' not in st.session_state:
-            st.session_state.vocabulary_list = []
     
     @property
-    def vocabulary_list(self):
-        """獲取單字列表"""
-        return st.session_state.vocabulary_list
+    def vocab_columns(self) -> Dict[str, List[str]]:
+        """獲取欄式單字表"""
+        return st.session_state.vocab_columns
     
-    @vocabulary_list.setter
-    def vocabulary_list(self, value):
-        """設置單字列表"""
-        st.session_state.vocabulary_list = value
+    @vocab_columns.setter
+    def vocab_columns(self, value: Dict[str, List[str]]):
+        """設置欄式單字表（舊的單字索引隨之失效）"""
+        st.session_state.vocab_columns = value
+        st.session_state.current_deck_ids = None
+        # 單字數只在載入時改變，統計標籤跟著一次算好
+        st.session_state.vocab_count = len(value['word'])
+        st.session_state.stats_html = _STATS_TMPL.format(n=st.session_state.vocab_count)
+    
+    @property
+    def vocab_size(self) -> int:
+        """單字總數"""
+        return st.session_state.vocab_count
     
     def load_vocabulary_from_sheet(self, sheet_url: str):
         """從 Google Sheet 載入單字資料"""
-        if self.sheet_connector.setup_credentials_from_secrets():
-            if self.sheet_connector.connect_sheet(sheet_url):
-                df = self.sheet_connector.fetch_vocabulary_data()
-                if not df.empty:
-                    self.vocabulary_list = [
-                        Word(
-                            word=row['word'],
-                            explanation=row['explanation'],
-                            related_words=row['related_words'],
-                            pos=row['pos'],
-                            usage=row['usage'],
-                            sentence=row['sentence']
-                        ) for _, row in df.iterrows()
-                    ]
-                    return True
+        if self.sheet_connector.connect_sheet():
+            records = self.sheet_connector.fetch_vocabulary_data(sheet_url)
+            if records:
+                self.vocab_columns = {
+                    field: (_intern_column if field in INTERNED_FIELDS else list)(
+                        row[field] for row in records
+                    )
+                    for field in WORD_FIELDS
+                }
+                return True
         return False
     
     def load_sample_vocabulary(self):
         """載入範例單字資料（用於測試）"""
         sample_data = [
-            Word("aberrant", "偏離常軌的；異常的", "deviant, abnormal, atypical", "adj.", 
-                 "用來形容行為或現象偏離正常標準", "His aberrant behavior worried his friends."),
-            Word("abate", "減少；減輕", "diminish, subside, decrease", "v.", 
-                 "通常指強度、數量或程度的減少", "The storm began to abate after midnight."),
-            Word("abscond", "潛逃；逃匿", "flee, escape, run away", "v.", 
-                 "秘密地或突然地離開以避免後果", "The thief absconded with the jewelry."),
-            Word("abstemious", "節制的；節儉的", "temperate, moderate, restrained", "adj.", 
-                 "在飲食或享樂方面自我克制", "Despite his wealth, he lived an abstemious lifestyle."),
-            Word("admonish", "告誡；溫和地責備", "warn, caution, reprove", "v.", 
-                 "以溫和但嚴肅的方式提醒或警告", "The teacher admonished the students for talking during the exam.")
+            ("aberrant", "偏離常軌的；異常的", "deviant, abnormal, atypical", "adj.", 
+             "用來形容行為或現象偏離正常標準", "His aberrant behavior worried his friends."),
+            ("abate", "減少；減輕", "diminish, subside, decrease", "v.", 
+             "通常指強度、數量或程度的減少", "The storm began to abate after midnight."),
+            ("abscond", "潛逃；逃匿", "flee, escape, run away", "v.", 
+             "秘密地或突然地離開以避免後果", "The thief absconded with the jewelry."),
+            ("abstemious", "節制的；節儉的", "temperate, moderate, restrained", "adj.", 
+             "在飲食或享樂方面自我克制", "Despite his wealth, he lived an abstemious lifestyle."),
+            ("admonish", "告誡；溫和地責備", "warn, caution, reprove", "v.", 
+             "以溫和但嚴肅的方式提醒或警告", "The teacher admonished the students for talking during the exam.")
         ]
-        self.vocabulary_list = sample_data
+        self.vocab_columns = {
+            field: list(values) for field, values in zip(WORD_FIELDS, zip(*sample_data))
+        }
     
-    def get_random_word(self) -> Optional[Word]:
-        """隨機選擇一個單字"""
-        if self.vocabulary_list:
-            return random.choice(self.vocabulary_list)
-        return None
+    def get_word(self, idx: int) -> Word:
+        """依索引從欄式單字表取出單字"""
+        return Word(**{field: column[idx] for field, column in self.vocab_columns.items()})
+    
+    def get_random_ids(self, k: int = DECK_SIZE) -> List[int]:
+        """隨機選擇不重複的單字索引（最多 k 個）"""
+        return random.sample(range(self.vocab_size), min(k, self.vocab_size))
     
-    def create_new_card(self, word: Word) -> VocabularyCard:
-        """創建新的單字卡片"""
-        return VocabularyCard(word)
+    def create_new_card(self, idx: int) -> VocabularyCard:
+        """依單字索引創建單字卡片"""
+        return VocabularyCard(self.get_word(idx))
+    
+    def create_new_deck(self, ids: List[int], draw: int) -> VocabularyDeck:
+        """依單字索引創建一副單字卡片（draw 為第幾次抽選）"""
+        return VocabularyDeck([self.create_new_card(idx) for idx in ids], draw)
+
+
+@st.cache_resource
+def get_vocab_manager() -> VocabularyManager:
+    """取得所有 session 共用的單字管理器（資料本身存在各自的 session state）"""
+    return VocabularyManager()
+
+
+# 頁面上的靜態 HTML 片段
+_HEADER_HTML = """
+<div style="text-align: center; padding: 20px;">
+    <h1 style="color: white; font-size: 3em;">📚 GRE 單字學習卡</h1>
+</div>
+"""
+
+_STATS_TMPL = """
+<div style="text-align: center; margin: 20px 0;">
+    <span style="background: #E8F4FD; padding: 10px 20px; border-radius: 20px; color: #2E86AB;">
+        📊 總共 {n} 個單字
+    </span>
+</div>
+"""
+
+_HINT_HTML = """
+<div style="text-align: center; margin-top: 30px; color: #666;">
+    💡 點擊翻轉按鈕查看釋義，點擊「下一個單字」繼續學習，這一輪看完後再點擊「隨機抽選新單字」
+</div>
+"""
+
+_FOOTER_HTML = """
+<div style="text-align: center; margin-top: 50px; color: #999; border-top: 1px solid #eee; padding-top: 20px;">
+    Made with ❤️ using Streamlit | GRE 單字學習工具
+</div>
+"""
+
+_HELP_MD = """
+### 如何使用這個 GRE 單字學習工具：
+
+#### 1. 設置資料來源
+- **範例資料**: 直接使用內建的範例單字開始學習
+- **Google Sheet**: 連接您自己的 Google Sheet 單字表
+
+#### 2. Google Sheet 設置步驟
+1. 創建 Google Service Account 並下載 JSON 憑證檔案
+2. 在 Google Sheet 中分享給 Service Account 的 email
+3. 確保您的 Sheet 包含以下欄位：
+   - `word`: 英文單字
+   - `explanation`: 中文釋義
+   - `related_words`: 相關詞彙
+   - `pos`: 詞性
+   - `usage`: 用法說明
+   - `sentence`: 例句
+
+#### 3. 開始學習
+- 點擊「隨機抽選新單字」抽出一輪單字開始
+- 先看英文，思考意思後點擊翻轉查看答案，再點擊「下一個單字」
+- 這一輪看完後，再次點擊「隨機抽選新單字」
+- 重複練習直到熟記所有單字
+
+#### 4. 學習建議
+- 建議每次學習 10-20 個單字
+- 多次複習已學過的單字
+- 注意相關詞彙和例句的使用
+"""
 
 
 class GREVocabularyApp:
     """GRE 單字學習應用程式主類別"""
     
     def __init__(self):
-        self.vocab_manager = VocabularyManager()
+        self.vocab_manager = get_vocab_manager()
         self.init_session_state()
     
     def init_session_state(self):
         """初始化 session state"""
-        if 'current_card' not in st.session_state:
-            st.session_state.current_card = None
+        if 'current_deck_ids' not in st.session_state:
+            st.session_state.current_deck_ids = None
+        if 'draw_count' not in st.session_state:
+            st.session_state.draw_count = 0
         if 'vocabulary_loaded' not in st.session_state:
             st.session_state.vocabulary_loaded = False
-        if 'vocabulary_list' not in st.session_state:
-            st.session_state.vocabulary_list = []
+        # 單字表以欄式儲存，以索引對應同一個單字
+        if 'vocab_columns' not in st.session_state:
+            st.session_state.vocab_columns = _empty_columns()
+            st.session_state.vocab_count = 0
+            st.session_state.stats_html = ""
+    
+    def draw_new_word(self):
+        """抽選新一輪單字（按鈕 callback，於 rerun 前更新目前卡片）"""
+        word_ids = self.vocab_manager.get_random_ids()
+        if word_ids:
+            st.session_state.current_deck_ids = word_ids
+            st.session_state.draw_count += 1
     
     def render_header(self):
-        """渲染應用程式標題"""
-        st.markdown("""
-        <div style="text-align: center; padding: 20px;">
-            <h1 style="color: white; font-size: 3em;">📚 GRE 單字學習卡</h1>
-        </div>
-        """, unsafe_allow_html=True)
+        """渲染應用程式標題（已載入單字時連同統計資訊一起送出）"""
+        if st.session_state.vocabulary_loaded and self.vocab_manager.vocab_size:
+            st.html(_HEADER_HTML + st.session_state.stats_html)
+        else:
+            st.html(_HEADER_HTML)
     
+    @st.fragment
     def render_setup_section(self):
-        """渲染設置區域"""
-        st.sidebar.header("🔧 設置")
+        """渲染設置區域（獨立 fragment，切換選項時不重跑整個頁面）"""
+        st.header("🔧 設置")
         
         # 選擇資料來源
-        data_source = st.sidebar.radio(
+        data_source = st.radio(
             "選擇單字資料來源:",
             ["使用範例資料", "連接 Google Sheet"]
         )
         
         if data_source == "使用範例資料":
-            if st.sidebar.button("載入範例單字", key="load_sample"):
+            if st.button("載入範例單字", key="load_sample"):
                 self.vocab_manager.load_sample_vocabulary()
                 st.session_state.vocabulary_loaded = True
-                st.sidebar.success("範例單字載入成功！")
+                st.session_state.setup_message = "範例單字載入成功！"
+                # 資料已更新，重跑整個頁面讓學習區域顯示新單字表
+                st.rerun()
         
         elif data_source == "連接 Google Sheet":
-            st.sidebar.markdown("### Google Sheet 設置")
+            st.markdown("### Google Sheet 設置")
             
             # Sheet URL 輸入
             sheet_url = "https://docs.google.com/spreadsheets/d/1CVhtwrXiDoeEn9RFwu-swhmLS4LobDJpcm-CbEHutt4/edit?gid=0#gid=0"
             
-            if st.sidebar.button("連接 Google Sheet", key="connect_sheet"):
+            if st.button("連接 Google Sheet", key="connect_sheet"):
                 if sheet_url:
                     # 嘗試連接（使用 secrets.toml 中的憑證）
                     if self.vocab_manager.load_vocabulary_from_sheet(sheet_url):
                         st.session_state.vocabulary_loaded = True
-                        st.sidebar.success(f"Google Sheet 連接成功！載入了 {len(st.session_state.vocabulary_list)} 個單字")
+                        st.session_state.setup_message = f"Google Sheet 連接成功！載入了 {self.vocab_manager.vocab_size} 個單字"
+                        st.rerun()
                     else:
-                        st.sidebar.error("連接失敗，請檢查 Sheet URL 和 secrets.toml 設置")
+                        st.error("連接失敗，請檢查 Sheet URL 和 secrets.toml 設置")
                 else:
-                    st.sidebar.warning("請提供 Sheet URL")
-            
-            
+                    st.warning("請提供 Sheet URL")
+        
+        # 載入成功訊息在整頁重跑後顯示一次
+        message = st.session_state.pop('setup_message', None)
+        if message:
+            st.success(message)
     
     def render_study_section(self):
         """渲染學習區域"""
@@ -328,88 +645,40 @@ class GREVocabularyApp:
             st.info("請先在左側欄位載入單字資料")
             return
         
-        if not st.session_state.vocabulary_list:
+        if not self.vocab_manager.vocab_size:
             st.error("沒有可用的單字資料")
             return
         
-        # 顯示統計資訊
-        st.markdown(f"""
-        <div style="text-align: center; margin: 20px 0;">
-            <span style="background: #E8F4FD; padding: 10px 20px; border-radius: 20px; color: #2E86AB;">
-                📊 總共 {len(st.session_state.vocabulary_list)} 個單字
-            </span>
-        </div>
-        """, unsafe_allow_html=True)
-        
+        # 統計資訊已與標題一起在 render_header 送出
+        self.render_card_section()
+    
+    @st.fragment
+    def render_card_section(self):
+        """渲染抽選按鈕與單字卡片（獨立 fragment，抽選時只重跑這一區）"""
         # 抽選新單字按鈕
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            if st.button("🎲 隨機抽選新單字", key="random_word", type="primary", use_container_width=True):
-                word = self.vocab_manager.get_random_word()
-                if word:
-                    st.session_state.current_card = self.vocab_manager.create_new_card(word)
-                    st.rerun()
+            st.button("🎲 隨機抽選新單字", key="random_word", type="primary",
+                      on_click=self.draw_new_word, use_container_width=True)
         
         # 顯示單字卡片
-        if st.session_state.current_card:
+        if st.session_state.current_deck_ids:
             self.render_vocabulary_card()
     
     def render_vocabulary_card(self):
         """渲染單字卡片"""
-        card = st.session_state.current_card
-        
-        # 翻轉按鈕
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            button_text = "🔄 顯示中文釋義" if not card.is_flipped else "🔄 顯示英文"
-            if st.button(button_text, key="flip_card", use_container_width=True):
-                card.flip_card()
-                st.rerun()
-        
-        # 顯示卡片內容
-        if not card.is_flipped:
-            card.render_front()
-        else:
-            card.render_back()
+        deck = self.vocab_manager.create_new_deck(
+            st.session_state.current_deck_ids, st.session_state.draw_count
+        )
+        deck.render()
         
         # 學習進度提示
-        st.markdown("""
-        <div style="text-align: center; margin-top: 30px; color: #666;">
-            💡 點擊翻轉按鈕查看釋義，點擊「隨機抽選新單字」繼續學習
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(_HINT_HTML)
     
     def render_instructions(self):
         """渲染使用說明"""
         with st.expander("📖 使用說明"):
-            st.markdown("""
-            ### 如何使用這個 GRE 單字學習工具：
-            
-            #### 1. 設置資料來源
-            - **範例資料**: 直接使用內建的範例單字開始學習
-            - **Google Sheet**: 連接您自己的 Google Sheet 單字表
-            
-            #### 2. Google Sheet 設置步驟
-            1. 創建 Google Service Account 並下載 JSON 憑證檔案
-            2. 在 Google Sheet 中分享給 Service Account 的 email
-            3. 確保您的 Sheet 包含以下欄位：
-               - `word`: 英文單字
-               - `explanation`: 中文釋義
-               - `related_words`: 相關詞彙
-               - `pos`: 詞性
-               - `usage`: 用法說明
-               - `sentence`: 例句
-            
-            #### 3. 開始學習
-            - 點擊「隨機抽選新單字」開始
-            - 先看英文，思考意思後點擊翻轉查看答案
-            - 重複練習直到熟記所有單字
-            
-            #### 4. 學習建議
-            - 建議每次學習 10-20 個單字
-            - 多次複習已學過的單字
-            - 注意相關詞彙和例句的使用
-            """)
+            st.markdown(_HELP_MD)
     
     def run(self):
         """運行應用程式"""
@@ -421,16 +690,13 @@ class GREVocabularyApp:
         
         # 渲染各個區域
         self.render_header()
-        self.render_setup_section()
+        with st.sidebar:
+            self.render_setup_section()
         self.render_study_section()
         self.render_instructions()
         
         # 頁腳
-        st.markdown("""
-        <div style="text-align: center; margin-top: 50px; color: #999; border-top: 1px solid #eee; padding-top: 20px;">
-            Made with ❤️ using Streamlit | GRE 單字學習工具
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(_FOOTER_HTML)
 
 
 def main():